@@ -1,13 +1,29 @@
+import numpy as np
 import pandas as pd
 
+# Use the faster calamine reader when available, otherwise openpyxl in read-only mode
+try:
+    import python_calamine  # noqa: F401
+    read_engine = "calamine"
+    read_kwargs = {}
+except ImportError:
+    read_engine = "openpyxl"
+    read_kwargs = {"engine_kwargs": {"read_only": True, "data_only": True, "keep_links": False}}
+
 # Launch the Excel File
-df = pd.read_excel("merged_sales_data.xlsx", engine="openpyxl")
+df = pd.read_excel("merged_sales_data.xlsx", engine=read_engine, **read_kwargs)
 
 # Convert column names to lowercase
 df.columns = df.columns.str.lower()
 
 # Fill missing values with 0 (so that you preserve rows with partial missing data)
-df.fillna(0, inplace=True)
+# Float columns are filled with NumPy directly; other columns use fillna
+for col in df.columns:
+    if df[col].dtype.kind == "f":
+        arr = df[col].to_numpy()
+        df[col] = np.where(np.isnan(arr), 0, arr)
+    elif df[col].hasnans:
+        df[col] = df[col].fillna(0)
 
 # If you want to drop rows that are completely empty, do so:
 df.dropna(how="all", inplace=True)
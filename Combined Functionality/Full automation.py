@@ -1,16 +1,99 @@
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 import glob
 import os
 import json
 import logging
+import shutil
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
-def merge_excel_files(data_folder, merged_file, sheet_name=None, verbose=False):
+# Copy-on-Write: subsets and derived frames share memory until modified, so the
+# pipeline does not need defensive copies. It is always on from pandas 3, where
+# the option is deprecated.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+# Prefer the Rust-backed calamine reader (pandas >= 2.2); fall back to openpyxl
+# when the python-calamine wheel is not installed.
+# In the openpyxl case, open workbooks in streaming read-only mode instead of
+# building the full in-memory DOM.
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_READ_ENGINE = "calamine"
+    EXCEL_READ_KWARGS = {}
+except ImportError:
+    EXCEL_READ_ENGINE = "openpyxl"
+    EXCEL_READ_KWARGS = {
+        "engine_kwargs": {"read_only": True, "data_only": True, "keep_links": False}
+    }
+
+def _profit_margin(df):
+    """
+    Vectorized profit margin (profit / revenue * 100), with 0 where revenue is 0.
+    """
+    rev = df["revenue"].to_numpy(dtype="float64", na_value=np.nan)
+    profit = df["profit"].to_numpy(dtype="float64", na_value=np.nan)
+    return np.where(rev != 0, profit / np.where(rev != 0, rev, 1) * 100, 0.0)
+
+def _fast_fillna(df, value):
+    """
+    Fill missing values with a scalar, one column at a time.
+    Numeric columns are filled with np.where as float64, so a fractional fill
+    value is never truncated into an integer column; other columns use
+    Series.fillna. Columns without missing values are left untouched.
+    """
+    for col in df.columns:
+        values = df[col]
+        if not values.hasnans:
+            continue
+        if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+            arr = values.to_numpy(dtype="float64", na_value=np.nan)
+            df[col] = np.where(np.isnan(arr), value, arr)
+        elif pd.api.types.is_string_dtype(values.dtype) and not isinstance(values.dtype, np.dtype):
+            # Extension (e.g. Arrow-backed) string columns reject numeric fill values.
+            df[col] = values.astype(object).fillna(value)
+        else:
+            df[col] = values.fillna(value)
+    return df
+
+def _parse_dates(values, date_format=None):
+    """
+    Convert a column to datetime; non-parsable values become NaT.
+    Without date_format pandas infers the format from the first value.
+    Prints a warning if any non-empty values could not be parsed.
+    """
+    parsed = pd.to_datetime(values, errors="coerce", format=date_format)
+    unparsed = int((parsed.isna() & values.notna()).sum())
+    if unparsed:
+        print(f"Warning: {unparsed} value(s) in date column '{values.name}' could not be parsed and were set to NaT.")
+    return parsed
+
+def _read_one(file, sheet_name=None):
+    """
+    Read a single Excel file and tag its rows with the source file name.
+    Runs in a worker process, so it must stay a top-level function.
+    """
+    # If sheet_name is None, read all sheets (returns a dict) and merge them.
+    raw_data = pd.read_excel(file, engine=EXCEL_READ_ENGINE, sheet_name=sheet_name, **EXCEL_READ_KWARGS)
+    if isinstance(raw_data, dict):
+        df = pd.concat(raw_data.values(), ignore_index=True)
+    else:
+        df = raw_data
+    
+    # Add a column indicating the source file.
+    df["source_file"] = os.path.basename(file)
+    return df
+
+def merge_excel_files(data_folder, merged_file, sheet_name=None, verbose=False, intermediate_format="parquet"):
     """
     Merge all Excel files in the given folder into a single DataFrame and save it.
     Reads a specific sheet (if provided) from each file; if sheet_name is None,
     it reads all sheets and concatenates them into a single DataFrame.
+    Files are read in parallel worker processes.
+    The merged data is saved in intermediate_format ('parquet', 'csv' or 'xlsx');
+    the extension of merged_file is adjusted to match.
     """
     file_pattern = os.path.join(data_folder, "*.xlsx")
     files = glob.glob(file_pattern)
@@ -18,23 +101,40 @@ def merge_excel_files(data_folder, merged_file, sheet_name=None, verbose=False):
     if not files:
         raise FileNotFoundError(f"No Excel files found in folder: {data_folder}")
     
-    all_data = []
-    for file in files:
-        if verbose:
+    if verbose:
+        for file in files:
             print(f"Reading file: {file}")
-        # If sheet_name is None, read all sheets (returns a dict) and merge them.
-        raw_data = pd.read_excel(file, engine="openpyxl", sheet_name=sheet_name)
-        if isinstance(raw_data, dict):
-            df = pd.concat(raw_data.values(), ignore_index=True)
-        else:
-            df = raw_data
-        
-        # Add a column indicating the source file.
-        df["source_file"] = os.path.basename(file)
-        all_data.append(df)
+    # Files are independent and parsing is CPU-bound, so read them in parallel
+    # processes; map() keeps the results in file order.
+    max_workers = min(len(files), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        all_data = list(executor.map(_read_one, files, [sheet_name] * len(files)))
     
     merged_df = pd.concat(all_data, ignore_index=True)
-    merged_df.to_excel(merged_file, index=False)
+    base, _ = os.path.splitext(merged_file)
+    if intermediate_format == "parquet":
+        merged_file = base + ".parquet"
+        # Parquet columns need a single type; store mixed number/text columns as
+        # text in the file (merged_df itself is left unchanged).
+        mixed_cols = [
+            c for c in merged_df.columns
+            if merged_df[c].dtype == object
+            and pd.api.types.infer_dtype(merged_df[c], skipna=True) in ("mixed", "mixed-integer")
+        ]
+        parquet_df = merged_df
+        if mixed_cols:
+            parquet_df = merged_df.assign(**{
+                c: merged_df[c].where(merged_df[c].isna(), merged_df[c].astype(str)) for c in mixed_cols
+            })
+        parquet_df.to_parquet(merged_file, engine="pyarrow", compression="zstd", index=False)
+    elif intermediate_format == "csv":
+        merged_file = base + ".csv"
+        merged_df.to_csv(merged_file, index=False)
+    elif intermediate_format == "xlsx":
+        merged_file = base + ".xlsx"
+        merged_df.to_excel(merged_file, index=False)
+    else:
+        raise ValueError("Unsupported intermediate format.")
     if verbose:
         print(f"Merged file saved as '{merged_file}'\n")
     
@@ -51,38 +151,42 @@ def process_data(df, args):
       - Creates a summary using the specified aggregation method.
     Returns the cleaned DataFrame and a summary DataFrame.
     """
-    # Standardize column names to lowercase.
-    df.columns = df.columns.str.lower()
-    
     # Apply user-defined transformations from a JSON config if provided.
+    rename = {}
     if args.config:
         try:
             with open(args.config, 'r') as f:
                 config = json.load(f)
-            if "rename_columns" in config:
-                df.rename(columns=config["rename_columns"], inplace=True)
+            rename = {k.lower(): v for k, v in (config.get("rename_columns") or {}).items()}
             # Additional transformations can be added here.
             if args.verbose:
                 print("Applied user-defined transformations from config.")
         except Exception as e:
             print(f"Error reading config file: {e}")
     
+    # Standardize column names to lowercase and apply any renames in one pass.
+    df.columns = [rename.get(str(c).lower(), str(c).lower()) for c in df.columns]
+    
     # Data cleaning: either drop rows with missing values or fill them.
     if args.dropna:
-        df.dropna(inplace=True)
+        df = df.dropna()
         if args.verbose:
             print("Dropped rows with missing values.")
     elif args.fillna is not None:
-        df.fillna(args.fillna, inplace=True)
+        df = _fast_fillna(df, args.fillna)
         if args.verbose:
             print(f"Filled missing values with {args.fillna}.")
     
+    # Convert the date column to datetime once.
+    # Recording the column in df.attrs lets generate_monthly_totals skip re-parsing it.
+    date_col = args.date_column.lower() if args.date_column else "date"
+    if date_col in df.columns:
+        df[date_col] = _parse_dates(df[date_col], args.date_format)
+        df.attrs["_date_parsed"] = date_col
+    
     # Date filtering (if start_date and end_date are provided).
     if args.start_date and args.end_date:
-        date_col = args.date_column.lower() if args.date_column else "date"
         if date_col in df.columns:
-            # Convert to datetime; non-parsable values become NaT.
-            df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
             try:
                 start_date = pd.to_datetime(args.start_date)
                 end_date = pd.to_datetime(args.end_date)
@@ -95,17 +199,23 @@ def process_data(df, args):
             print(f"Warning: Date column '{date_col}' not found; skipping date filtering.")
     
     # Custom filtering: Accept multiple filters in the format "column:value"
+    # All filters are combined into one boolean mask so the frame is copied once.
     if args.filter:
+        mask = np.ones(len(df), dtype=bool)
+        str_cols = {}
         for filt in args.filter:
             try:
                 col, val = filt.split(":", 1)
                 col = col.strip().lower()
                 val = val.strip()
-                df = df[df[col].astype(str) == val]
+                if col not in str_cols:
+                    str_cols[col] = df[col].astype("string")
+                mask &= (str_cols[col] == val).to_numpy(dtype=bool, na_value=False)
                 if args.verbose:
                     print(f"Applied filter: {col} == {val}")
             except Exception as e:
                 print(f"Error processing filter '{filt}': {e}")
+        df = df.loc[mask]
     
     # Check for required columns to calculate profit.
     if "revenue" not in df.columns or "cost" not in df.columns:
@@ -117,19 +227,17 @@ def process_data(df, args):
     # Optionally calculate profit margin if requested.
     if args.calc_profit_margin:
         # Profit margin as a percentage; avoid division by zero.
-        df["profit_margin"] = df.apply(
-            lambda row: (row["profit"] / row["revenue"] * 100) if row["revenue"] != 0 else 0,
-            axis=1
-        )
+        df["profit_margin"] = _profit_margin(df)
         if args.verbose:
             print("Calculated profit margin.")
     
     # Create summary report using the specified aggregation method.
     agg_func = args.agg_method
+    agg = df[["revenue", "cost", "profit"]].agg(agg_func)
     summary = pd.DataFrame({
-        "Revenue": [df["revenue"].agg(agg_func)],
-        "Cost": [df["cost"].agg(agg_func)],
-        "Profit": [df["profit"].agg(agg_func)]
+        "Revenue": [agg["revenue"]],
+        "Cost": [agg["cost"]],
+        "Profit": [agg["profit"]]
     })
     if args.calc_profit_margin:
         summary["Profit Margin"] = (
@@ -150,23 +258,29 @@ def generate_pivot(df, args):
             pivot_index = args.pivot_index.lower()
             pivot_values = args.pivot_values.lower()
             if pivot_index in df.columns and pivot_values in df.columns:
-                pivot_table = pd.pivot_table(
-                    df,
-                    index=pivot_index,
-                    values=pivot_values,
-                    aggfunc=args.agg_method
+                # Grouping on categorical codes is much cheaper than hashing strings;
+                # the categorical key is local, so df itself is left unchanged.
+                pivot_key = df[pivot_index].astype("category")
+                # A single index/value pivot is just a group-by aggregation, which
+                # avoids the reshape pivot_table materializes.
+                pivot_table = (
+                    df.groupby(pivot_key, observed=True)[pivot_values]
+                    .agg(args.agg_method)
+                    .dropna()
+                    .reset_index()
                 )
                 if args.verbose:
                     print("Generated pivot table.")
-                return pivot_table.reset_index()
+                return pivot_table
             else:
                 print("Pivot table columns not found in data.")
     return None
 
-def generate_monthly_totals(df, date_column, agg_method, calc_profit_margin, verbose=False):
+def generate_monthly_totals(df, date_column, agg_method, calc_profit_margin, verbose=False, date_format=None):
     """
     Groups the DataFrame by month (using the specified date column) and computes totals.
     Also appends a final total row with overall sums.
+    The date column is only parsed (using date_format, if given) if process_data has not already done so.
     Returns a DataFrame with monthly totals and the final total row.
     """
     date_column = date_column.lower()
@@ -176,30 +290,30 @@ def generate_monthly_totals(df, date_column, agg_method, calc_profit_margin, ver
         return None
     
     # Ensure the date column is datetime.
-    df[date_column] = pd.to_datetime(df[date_column], errors="coerce")
+    if df.attrs.get("_date_parsed") != date_column:
+        df[date_column] = _parse_dates(df[date_column], date_format)
     
-    # Create a new column for month (e.g., "2023-01").
-    df["month"] = df[date_column].dt.to_period('M').astype(str)
+    # Create a new column for month (e.g., "2023-01"), kept as a Period so the
+    # group-by hashes integers instead of strings.
+    df["month"] = df[date_column].dt.to_period('M')
     
     # Group by month and sum revenue, cost, and profit.
-    monthly_totals = df.groupby("month").agg({
-        "revenue": "sum",
-        "cost": "sum",
-        "profit": "sum"
-    }).reset_index()
+    monthly_totals = df.groupby("month", observed=True, dropna=False)[["revenue", "cost", "profit"]].sum()
+    # The overall totals are the sum of the (few) monthly sums.
+    overall = monthly_totals.sum()
+    monthly_totals = monthly_totals.reset_index()
+    # Only the small aggregated column is converted to readable labels.
+    monthly_totals["month"] = monthly_totals["month"].astype(str)
     
     if calc_profit_margin:
-        monthly_totals["profit_margin"] = monthly_totals.apply(
-            lambda row: (row["profit"] / row["revenue"] * 100) if row["revenue"] != 0 else 0,
-            axis=1
-        )
+        monthly_totals["profit_margin"] = _profit_margin(monthly_totals)
     
     # Create a final total row.
     final_totals = {
         "month": "Final Total",
-        "revenue": df["revenue"].sum(),
-        "cost": df["cost"].sum(),
-        "profit": df["profit"].sum()
+        "revenue": overall["revenue"],
+        "cost": overall["cost"],
+        "profit": overall["profit"]
     }
     if calc_profit_margin:
         final_totals["profit_margin"] = (final_totals["profit"] / final_totals["revenue"] * 100) if final_totals["revenue"] != 0 else 0
@@ -211,6 +325,92 @@ def generate_monthly_totals(df, date_column, agg_method, calc_profit_margin, ver
         print("Generated monthly totals and final total row.")
     return monthly_totals
 
+# Rows converted to Python values per write_row block in _write_cleaned_sheet.
+WRITE_BLOCK_ROWS = 50_000
+
+def _write_cleaned_sheet(writer, cleaned_df, sheet_name="Cleaned Data"):
+    """
+    Write a value-only DataFrame to an xlsxwriter worksheet. The header row comes
+    from to_excel (so it is styled like the other sheets); the data rows are
+    written directly with write_row, one block of rows at a time.
+    Returns the worksheet.
+    """
+    cleaned_df.head(0).to_excel(writer, sheet_name=sheet_name, index=False)
+    ws = writer.sheets[sheet_name]
+    date_fmt = writer.book.add_format({"num_format": "yyyy-mm-dd hh:mm:ss"})
+    for idx in range(cleaned_df.shape[1]):
+        if pd.api.types.is_datetime64_any_dtype(cleaned_df.iloc[:, idx].dtype):
+            ws.set_column(idx, idx, None, date_fmt)
+    
+    for start in range(0, len(cleaned_df), WRITE_BLOCK_ROWS):
+        block = cleaned_df.iloc[start:start + WRITE_BLOCK_ROWS]
+        # Plain Python columns for this block, with missing values as None (blank cells).
+        columns = []
+        for idx in range(block.shape[1]):
+            values = block.iloc[:, idx]
+            missing = values.isna().to_numpy()
+            if isinstance(values.dtype, pd.PeriodDtype):
+                values = values.astype(str)
+            # Copy explicitly: under Copy-on-Write to_numpy() may return a read-only view.
+            values = values.to_numpy(dtype=object, copy=True)
+            values[missing] = None
+            columns.append(values.tolist())
+        for r, row in enumerate(zip(*columns), start=start + 1):
+            ws.write_row(r, 0, row)
+    return ws
+
+def _write_csv(df, path):
+    """
+    Write a DataFrame to CSV with pyarrow's C++ writer, falling back to
+    DataFrame.to_csv when pyarrow is missing, cannot convert a column
+    (e.g. object columns holding mixed types), or a value would need quoting.
+    Values are formatted the same way to_csv formats them, so the output
+    matches the other report files.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        df.to_csv(path, index=False)
+        return
+    # Columns Arrow cannot render like to_csv are pre-formatted as text the way
+    # to_csv writes them: Period columns have no Arrow CSV form, Arrow would
+    # write timezone-aware timestamps as the UTC instant without their offset,
+    # booleans as true/false instead of True/False, and floats without ".0"
+    # or exponents ("1200", "0.00001" instead of "1200.0", "1e-05").
+    text_cols = [
+        c for c in df.columns
+        if isinstance(df[c].dtype, (pd.PeriodDtype, pd.DatetimeTZDtype))
+        or pd.api.types.is_bool_dtype(df[c].dtype)
+        or pd.api.types.is_float_dtype(df[c].dtype)
+        or (df[c].dtype == object and pd.api.types.infer_dtype(df[c], skipna=True) == "boolean")
+    ]
+    # Like to_csv, date columns without any time of day are written as dates only.
+    date_only_cols = set()
+    for c in df.columns:
+        if isinstance(df[c].dtype, np.dtype) and df[c].dtype.kind == "M":
+            dates = df[c].dropna()
+            if (dates == dates.dt.normalize()).all():
+                date_only_cols.add(c)
+    if text_cols:
+        df = df.assign(**{c: df[c].astype(str).where(df[c].notna(), None) for c in text_cols})
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        # Write timestamps at second resolution rather than with nanosecond digits;
+        # the safe cast raises (and falls back) if that would drop sub-second data.
+        for i, field in enumerate(table.schema):
+            if pa.types.is_timestamp(field.type):
+                target = pa.date32() if df.columns[i] in date_only_cols else pa.timestamp("s")
+                table = table.set_column(i, field.name, table.column(i).cast(target))
+        # The header comes from to_csv (pyarrow always quotes it). Values are not
+        # quoted, like to_csv; any value that would need quotes raises and falls back.
+        df.head(0).to_csv(path, index=False)
+        with open(path, "ab") as f:
+            pacsv.write_csv(table, f,
+                            write_options=pacsv.WriteOptions(include_header=False, quoting_style="none"))
+    except (pa.ArrowException, TypeError, ValueError):
+        df.to_csv(path, index=False)
+
 def save_report(cleaned_df, summary, pivot_df, monthly_totals, output_file, output_format, verbose=False, color_code=False):
     """
     Saves the cleaned data, summary, pivot table, and monthly totals.
@@ -220,59 +420,51 @@ def save_report(cleaned_df, summary, pivot_df, monthly_totals, output_file, outp
     to the 'profit' column in the 'Cleaned Data' sheet.
     """
     if output_format == "xlsx":
-        with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
-            cleaned_df.to_excel(writer, sheet_name="Cleaned Data", index=False)
+        with pd.ExcelWriter(output_file, engine="xlsxwriter") as writer:
+            # The (large) cleaned data is written directly; the small sheets use to_excel.
+            ws = _write_cleaned_sheet(writer, cleaned_df)
             summary.to_excel(writer, sheet_name="Summary Report", index=False)
             if pivot_df is not None:
                 pivot_df.to_excel(writer, sheet_name="Pivot Table", index=False)
             if monthly_totals is not None:
                 monthly_totals.to_excel(writer, sheet_name="Monthly Totals", index=False)
+            
+            # Apply color coding if requested, while the workbook is still open.
+            if color_code:
+                try:
+                    from xlsxwriter.utility import xl_col_to_name
+                    
+                    if "profit" in cleaned_df.columns:
+                        workbook = writer.book
+                        profit_col = xl_col_to_name(cleaned_df.columns.get_loc("profit"))
+                        max_row = len(cleaned_df) + 1
+                        cell_range = f"{profit_col}2:{profit_col}{max_row}"
+                        red_fill = workbook.add_format({"bg_color": "#FFC7CE"})
+                        green_fill = workbook.add_format({"bg_color": "#C6EFCE"})
+                        yellow_fill = workbook.add_format({"bg_color": "#FFEB9C"})
+                        
+                        ws.conditional_format(cell_range,
+                            {"type": "cell", "criteria": "<", "value": 0, "format": red_fill})
+                        ws.conditional_format(cell_range,
+                            {"type": "cell", "criteria": ">", "value": 0, "format": green_fill})
+                        ws.conditional_format(cell_range,
+                            {"type": "cell", "criteria": "==", "value": 0, "format": yellow_fill})
+                        
+                        if verbose:
+                            print("Applied color coding to 'profit' column in 'Cleaned Data' sheet.")
+                    else:
+                        if verbose:
+                            print("No 'profit' column found for color coding.")
+                except Exception as e:
+                    print(f"Error applying color coding: {e}")
         if verbose:
             print(f"Final report saved as '{output_file}'")
-        
-        # Apply color coding if requested.
-        if color_code:
-            try:
-                from openpyxl import load_workbook
-                from openpyxl.formatting.rule import CellIsRule
-                from openpyxl.styles import PatternFill
-                
-                wb = load_workbook(output_file)
-                ws = wb["Cleaned Data"]
-                profit_col = None
-                # Find the column letter for the "profit" header.
-                for cell in ws[1]:
-                    if cell.value and str(cell.value).strip().lower() == "profit":
-                        profit_col = cell.column_letter
-                        break
-                
-                if profit_col:
-                    max_row = ws.max_row
-                    red_fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
-                    green_fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
-                    yellow_fill = PatternFill(start_color='FFEB9C', end_color='FFEB9C', fill_type='solid')
-                    
-                    ws.conditional_formatting.add(f"{profit_col}2:{profit_col}{max_row}",
-                        CellIsRule(operator='lessThan', formula=['0'], fill=red_fill))
-                    ws.conditional_formatting.add(f"{profit_col}2:{profit_col}{max_row}",
-                        CellIsRule(operator='greaterThan', formula=['0'], fill=green_fill))
-                    ws.conditional_formatting.add(f"{profit_col}2:{profit_col}{max_row}",
-                        CellIsRule(operator='equal', formula=['0'], fill=yellow_fill))
-                    
-                    if verbose:
-                        print("Applied color coding to 'profit' column in 'Cleaned Data' sheet.")
-                else:
-                    if verbose:
-                        print("No 'profit' column found for color coding.")
-                wb.save(output_file)
-            except Exception as e:
-                print(f"Error applying color coding: {e}")
                 
     elif output_format == "csv":
         base, _ = os.path.splitext(output_file)
         cleaned_file = base + "_cleaned.csv"
         summary_file = base + "_summary.csv"
-        cleaned_df.to_csv(cleaned_file, index=False)
+        _write_csv(cleaned_df, cleaned_file)
         summary.to_csv(summary_file, index=False)
         if verbose:
             print(f"CSV reports saved as '{cleaned_file}' and '{summary_file}'.")
@@ -293,13 +485,14 @@ def archive_files(files, archive_folder, verbose=False):
     """
     Moves all files in the list to the archive folder.
     Creates the archive folder if it does not exist.
+    shutil.move renames within a filesystem and falls back to copy + delete
+    when the archive folder is on a different mount.
     """
-    if not os.path.exists(archive_folder):
-        os.makedirs(archive_folder)
+    os.makedirs(archive_folder, exist_ok=True)
     for file in files:
         base = os.path.basename(file)
         destination = os.path.join(archive_folder, base)
-        os.rename(file, destination)
+        shutil.move(file, destination)
         if verbose:
             print(f"Archived '{file}' to '{destination}'.")
 
@@ -310,7 +503,10 @@ def main():
     parser.add_argument("--data-folder", default="data",
                         help="Folder containing Excel files to merge (default: 'data')")
     parser.add_argument("--merged-file", default="merged_sales_data.xlsx",
-                        help="Filename for the merged Excel file (default: 'merged_sales_data.xlsx')")
+                        help="Filename for the merged data file; its extension follows --intermediate-format "
+                             "(default: 'merged_sales_data.parquet')")
+    parser.add_argument("--intermediate-format", choices=["xlsx", "parquet", "csv"], default="parquet",
+                        help="Format for the merged data file; the extension of --merged-file is adjusted to match (default: parquet)")
     parser.add_argument("--sheet-name", default=None,
                         help="Sheet name to read from each Excel file (default: first sheet if not specified)")
     
@@ -331,6 +527,9 @@ def main():
     parser.add_argument("--end-date", help="End date for filtering (YYYY-MM-DD)")
     parser.add_argument("--date-column", default="date",
                         help="Column name for date filtering (default: 'date')")
+    parser.add_argument("--date-format", default=None,
+                        help="strftime format of the date column, e.g. '%%d/%%m/%%Y', or 'mixed' to infer per value "
+                             "(default: inferred from the first value)")
     
     # Custom filtering: multiple --filter entries in the format "column:value"
     parser.add_argument("--filter", action="append",
@@ -382,7 +581,8 @@ def main():
     
     try:
         # Merge Excel files from the specified folder.
-        merged_df, files = merge_excel_files(args.data_folder, args.merged_file, args.sheet_name, args.verbose)
+        merged_df, files = merge_excel_files(args.data_folder, args.merged_file, args.sheet_name, args.verbose,
+                                             args.intermediate_format)
         
         # Process the merged data.
         cleaned_df, summary = process_data(merged_df, args)
@@ -391,7 +591,8 @@ def main():
         pivot_df = generate_pivot(cleaned_df, args)
         
         # Always generate monthly totals if the date column is present.
-        monthly_totals = generate_monthly_totals(cleaned_df, args.date_column, args.agg_method, args.calc_profit_margin, args.verbose)
+        monthly_totals = generate_monthly_totals(cleaned_df, args.date_column, args.agg_method, args.calc_profit_margin, args.verbose,
+                                                 args.date_format)
         
         # Save the final report (including monthly totals and color coding if requested).
         save_report(cleaned_df, summary, pivot_df, monthly_totals, args.output, args.output_format, args.verbose, args.color_code)
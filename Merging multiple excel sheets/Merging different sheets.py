@@ -1,13 +1,20 @@
 import glob
 import pandas as pd
 
+# Use the faster calamine reader when available, otherwise openpyxl
+try:
+    import python_calamine  # noqa: F401
+    read_engine = "calamine"
+except ImportError:
+    read_engine = "openpyxl"
+
 # Get all Excel files in the folder
 files = glob.glob("data/*.xlsx")  # Assumes files are in a 'data' folder
 
 all_data = []
 
 for file in files:
-    df = pd.read_excel(file, engine="openpyxl")
+    df = pd.read_excel(file, engine=read_engine)
     all_data.append(df)
 
 # Merge all data